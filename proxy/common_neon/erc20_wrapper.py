@@ -83,14 +83,22 @@ class ERC20Wrapper:
         self.token = token
         self.admin = admin
         self.mint_authority = mint_authority
+        self._auth_account_dict: Dict[str, SolPubKey] = dict()
 
     def get_auth_account_address(self, neon_account_address: str) -> SolPubKey:
+        # the address is a PDA of the contract and the account, find_program_address can take many hash rounds
+        auth_account = self._auth_account_dict.get(neon_account_address, None)
+        if auth_account is not None:
+            return auth_account
+
         neon_account_addressbytes = bytes(12) + bytes.fromhex(neon_account_address[2:])
         neon_contract_addressbytes = bytes.fromhex(self.neon_contract_address[2:])
-        return SolPubKey.find_program_address(
+        auth_account = SolPubKey.find_program_address(
             [ACCOUNT_SEED_VERSION, b"AUTH", neon_contract_addressbytes, neon_account_addressbytes],
             EVM_PROGRAM_ID
         )[0]
+        self._auth_account_dict[neon_account_address] = auth_account
+        return auth_account
 
     def _deploy_wrapper(self, contract: str, init_args: Tuple):
         compiled_interface = compile_source(ERC20FORSPL_INTERFACE_SOURCE)
@@ -114,6 +122,7 @@ class ERC20Wrapper:
         LOG.debug(f'tx_deploy_receipt: {tx_deploy_receipt}')
         LOG.debug(f'deploy status: {tx_deploy_receipt.status}')
         self.neon_contract_address = ChecksumAddress(tx_deploy_receipt.contractAddress)
+        self._auth_account_dict.clear()
         self.solana_contract_address = self.proxy.neon.get_neon_account(self.neon_contract_address).solanaAddress
 
         self.erc20 = self.proxy.eth.contract(address=self.neon_contract_address, abi=self.wrapper['abi'])
@@ -147,11 +156,10 @@ class ERC20Wrapper:
                            signer_acct: NeonAccount,
                            nonce: Optional[int] = None,
                            overrides: Optional[SolanaOverrides] = None):
-        erc20 = self.proxy.eth.contract(address=self.neon_contract_address, abi=self.wrapper['abi'])
         if nonce is None:
             nonce = self.proxy.eth.get_transaction_count(signer_acct.address)
 
-        claim_tx = erc20.functions.claimTo(
+        claim_tx = self.erc20.functions.claimTo(
             bytes(from_acct),
             to_acct.address,
             amount
@@ -204,5 +212,4 @@ class ERC20Wrapper:
         if isinstance(address, SolPubKey):
             return int(self.token.get_balance(address, Confirmed).value.amount)
 
-        erc20 = self.proxy.eth.contract(address=self.neon_contract_address, abi=self.interface['abi'])
-        return erc20.functions.balanceOf(address).call()
+        return self.erc20.functions.balanceOf(address).call()
@@ -6,6 +6,7 @@ from typing import Optional, List, Dict, cast
 
 from singleton_decorator import singleton
 from rlp import encode as rlp_encode
+from sha3 import keccak_256
 
 from solders.system_program import CreateAccountWithSeedParams, create_account_with_seed
 
@@ -151,6 +152,14 @@ class NeonIxBuilder:
         self._holder_msg = self._msg
         return self.init_neon_tx_sig(self._neon_tx.hex_tx_sig)
 
+    def init_neon_tx_msg(self, neon_tx_msg: bytes) -> NeonIxBuilder:
+        # the signature of NeonTx is the keccak of its RLP-encoded bytes
+        self._neon_tx = None
+
+        self._msg = neon_tx_msg
+        self._holder_msg = self._msg
+        return self.init_neon_tx_sig('0x' + keccak_256(neon_tx_msg).hexdigest())
+
     def init_neon_tx_sig(self, neon_tx_sig: str) -> NeonIxBuilder:
         self._neon_tx_sig = bytes.fromhex(neon_tx_sig[2:])
         evm_config = EVMConfig()
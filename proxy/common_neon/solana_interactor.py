@@ -63,9 +63,10 @@ class SolBlockStatus:
 
 
 class SolClient:
-    def __init__(self, solana_url: str, solana_timeout: float):
+    def __init__(self, solana_url: str, solana_timeout: float, pool_size: int = 10):
         self._solana_url = solana_url
         self._solana_timeout = solana_timeout
+        self._pool_size = pool_size
         self._fail_cnt = 0
         self._headers = {
             'Content-Type': 'application/json',
@@ -88,6 +89,10 @@ class SolClient:
 
         session = requests.Session()
         session.headers.update(self._headers)
+        # keep-alive connections for all threads, which send requests in parallel
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
         return session
 
     def post(self, request: Union[RPCRequest, RPCRequestList]) -> Union[RPCResponse, RPCResponseList]:
@@ -110,13 +115,13 @@ class SolClient:
 
 
 class SolInteractor:
-    def __init__(self, config: Config, solana_url: Optional[str] = None) -> None:
+    def __init__(self, config: Config, solana_url: Optional[str] = None, pool_size: int = 10) -> None:
         self._config = config
         self._request_cnt = itertools.count()
 
         timeout = config.solana_timeout
         solana_url_list = [solana_url] if solana_url else config.solana_url_list
-        self._client_list = [SolClient(url, timeout) for url in solana_url_list]
+        self._client_list = [SolClient(url, timeout, pool_size) for url in solana_url_list]
         self._last_client_idx = 0
 
     def __del__(self):
@@ -499,11 +504,12 @@ class SolInteractor:
         block_slot_list = response.get('result', list())
         return block_slot_list
 
-    def send_tx_list(self, tx_list: List[SolTx], skip_preflight: bool) -> List[SolSendResult]:
+    def send_tx_list(self, tx_list: List[SolTx], skip_preflight: bool,
+                     preflight_commitment=SolCommit.Processed) -> List[SolSendResult]:
         opts = {
             'skipPreflight': skip_preflight,
             'encoding': 'base64',
-            'preflightCommitment': SolCommit.Processed
+            'preflightCommitment': preflight_commitment
         }
 
         request_list = list()
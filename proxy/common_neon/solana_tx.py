@@ -98,6 +98,7 @@ class SolCommit:
 
 class SolTx(abc.ABC):
     _empty_block_hash = SolBlockHash.default()
+    max_size = _SolPktDataSize
 
     def __init__(self, name: str, ix_list: Optional[Sequence[SolTxIx]]) -> None:
         self._name = name
@@ -165,10 +166,14 @@ class SolTx(abc.ABC):
     def serialize(self) -> bytes:
         assert self._is_signed, 'transaction has not been signed'
         result = self._serialize()
-        if len(result) > _SolPktDataSize:
-            raise SolTxSizeError(len(result), _SolPktDataSize)
+        self._check_size(len(result))
         return result
 
+    @staticmethod
+    def _check_size(tx_len: int) -> None:
+        if tx_len > _SolPktDataSize:
+            raise SolTxSizeError(tx_len, _SolPktDataSize)
+
     def sign(self, signer: SolAccount) -> None:
         if signer.pubkey() != self.fee_payer:
             self.fee_payer = signer.pubkey()
@@ -11,6 +11,7 @@ from .solana_tx import SolTx, SolAccount, SolSig
 SolLegacyMsg = solders.message.Message
 
 _SolTxError = solders.transaction.TransactionError
+_SolSigSize = 64
 
 
 class SolLegacyTx(SolTx):
@@ -20,6 +21,13 @@ class SolLegacyTx(SolTx):
     def message(self) -> SolLegacyMsg:
         return self._solders_legacy_tx.message
 
+    def validate_size(self) -> None:
+        """Checks the size of the signed tx without signing it."""
+        msg = self._solders_legacy_tx.message
+        sig_cnt = msg.header.num_required_signatures
+        sig_cnt_len = 1 if sig_cnt < 0x80 else 2  # compact-u16
+        self._check_size(sig_cnt_len + sig_cnt * _SolSigSize + len(bytes(msg)))
+
     def _sig_result_list(self) -> List[bool]:
         return self._solders_legacy_tx.verify_with_results()
 
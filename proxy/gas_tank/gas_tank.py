@@ -36,7 +36,7 @@ class GasTank:
         self._gas_less_account_db = GasLessAccountsDB(self._db_conn)
         self._gas_less_account_dict: Dict[str, GasLessPermit] = dict()
 
-        self._solana = SolInteractor(config)
+        self._solana = SolInteractor(config, pool_size=config.gas_tank_parallel_request_cnt)
         self._config = config
 
         block_finder = SolFirstBlockFinder(self._solana)
@@ -1,46 +1,91 @@
+import functools
+import hashlib
 import logging
-import math
 
-from typing import Dict, Any, List, Optional
+import rlp
+
+from typing import Dict, Any, List, Optional, Tuple
 
 from ..common_neon.evm_config import EVMConfig
 from ..common_neon.data import NeonEmulatorResult, SolanaOverrides
-from ..common_neon.utils.eth_proto import NeonTx
 from ..common_neon.neon_instruction import NeonIxBuilder
 from ..common_neon.solana_alt_limit import ALTLimit
-from ..common_neon.solana_tx import SolAccount, SolPubKey, SolAccountMeta, SolBlockHash, SolTxSizeError
+from ..common_neon.solana_tx import SolAccount, SolPubKey, SolAccountMeta, SolBlockHash, SolTxSizeError, SolCommit
 from ..common_neon.solana_tx_legacy import SolLegacyTx
 from ..common_neon.solana_block import SolBlockInfo
 from ..common_neon.address import NeonAddress
 from ..common_neon.config import Config
+from ..common_neon.errors import EthereumError
 
 from ..neon_core_api.neon_core_api_client import NeonCoreApiClient
 
 LOG = logging.getLogger(__name__)
 
+# TODO: should be moved to neon-core-api
+_HOLDER_MSG_SIZE = 950
+_PER_CHUNK_FEE = 5000
+
+_ALT_MAX_TX_ACCOUNT_CNT = int(ALTLimit.max_tx_account_cnt)
+_ALT_COST = _PER_CHUNK_FEE * 12  # ALT ix: create + ceil(256/30) extend + deactivate + close
+
+
+# This values doesn't used on real network, they are used only to generate temporary data
+_HOLDER = SolAccount.from_seed(bytes([
+    61, 147, 166, 57, 23, 88, 41, 136, 224, 223, 120, 142, 155, 123, 221, 134,
+    16, 102, 170, 82, 76, 94, 95, 178, 125, 232, 191, 172, 103, 157, 145, 190
+]))
+_SIGNER = SolAccount.from_seed(bytes([
+    161, 247, 66, 157, 203, 188, 141, 236, 124, 123, 200, 192, 255, 23, 161, 34,
+    116, 202, 70, 182, 176, 194, 195, 168, 185, 132, 161, 142, 203, 57, 245, 90
+]))
+_BLOCK_HASH = SolBlockHash.from_string('4NCYB3kRT8sCNodPNuCZo8VUh4xqpBQxsxed2wd9xaD4')
+
+# The probe NeonTx has the same nonce, gasPrice and signature for all requests,
+#   so they are RLP-encoded once, and only gasLimit, to, value and callData are encoded per request
+_U256_MAX = (1 << 256) - 1
+_PROBE_NEON_TX_HEAD = rlp.encode(_U256_MAX) * 2  # nonce, gasPrice
+_PROBE_NEON_TX_TAIL = b''.join(rlp.encode(v) for v in (
+    245022934 * 1024 + 35,
+    0x1820182018201820182018201820182018201820182018201820182018201820,
+    0x1820182018201820182018201820182018201820182018201820182018201820
+))  # v, r, s
+
+
+def _encode_probe_neon_tx(gas_limit: int, to_addr: bytes, value: int, call_data: bytes) -> bytes:
+    payload = b''.join((
+        _PROBE_NEON_TX_HEAD,
+        rlp.encode(gas_limit),
+        rlp.encode(to_addr),
+        rlp.encode(value),
+        rlp.encode(call_data),
+        _PROBE_NEON_TX_TAIL
+    ))
+    return rlp.codec.length_prefix(len(payload), 0xc0) + payload
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_sol_pubkey(key: str) -> SolPubKey:
+    return SolPubKey.from_string(key)
+
 
 class _GasTxBuilder:
+    __slots__ = ('_signer', '_block_hash', '_neon_ix_builder', '_tx_size_dict')
+
+    _tx_size_cache_len = 256
+
     def __init__(self):
-        # This values doesn't used on real network, they are used only to generate temporary data
-        holder_key = bytes([
-            61, 147, 166, 57, 23, 88, 41, 136, 224, 223, 120, 142, 155, 123, 221, 134,
-            16, 102, 170, 82, 76, 94, 95, 178, 125, 232, 191, 172, 103, 157, 145, 190
-        ])
-        holder = SolAccount.from_seed(holder_key)
-
-        operator_key = bytes([
-            161, 247, 66, 157, 203, 188, 141, 236, 124, 123, 200, 192, 255, 23, 161, 34,
-            116, 202, 70, 182, 176, 194, 195, 168, 185, 132, 161, 142, 203, 57, 245, 90
-        ])
-        self._signer = SolAccount.from_seed(operator_key)
-        self._block_hash = SolBlockHash.from_string('4NCYB3kRT8sCNodPNuCZo8VUh4xqpBQxsxed2wd9xaD4')
+        self._signer = _SIGNER
+        self._block_hash = _BLOCK_HASH
 
         self._neon_ix_builder = NeonIxBuilder(self._signer.pubkey())
-        self._neon_ix_builder.init_iterative(holder.pubkey())
+        self._neon_ix_builder.init_iterative(_HOLDER.pubkey())
         self._neon_ix_builder.init_operator_neon(SolPubKey.default())
 
-    def build_tx(self, config: Config, tx: NeonTx, account_list: List[SolAccountMeta]) -> SolLegacyTx:
-        self._neon_ix_builder.init_neon_tx(tx)
+        # LRU: (hash of neon tx, account list, cu limit, cu priority fee) -> is tx size exceeded
+        self._tx_size_dict: Dict[Tuple[bytes, Tuple[SolAccountMeta, ...], int, int], bool] = dict()
+
+    def _build_tx(self, config: Config, neon_tx_msg: bytes, account_list: List[SolAccountMeta]) -> SolLegacyTx:
+        self._neon_ix_builder.init_neon_tx_msg(neon_tx_msg)
         self._neon_ix_builder.init_neon_account_list(account_list)
 
         ix_list = [
@@ -55,18 +100,50 @@ class _GasTxBuilder:
         tx = SolLegacyTx(name='Estimate', ix_list=ix_list)
 
         tx.recent_block_hash = self._block_hash
-        tx.sign(self._signer)
         return tx
 
-    @property
-    def len_neon_tx(self) -> int:
-        return len(self._neon_ix_builder.holder_msg)
+    def is_tx_size_exceeded(self, config: Config, neon_tx_msg: bytes, account_list: List[SolAccountMeta]) -> bool:
+        key = (
+            hashlib.blake2b(neon_tx_msg, digest_size=16).digest(),
+            tuple(account_list),
+            config.cu_limit,
+            config.cu_priority_fee
+        )
+
+        is_exceeded = self._tx_size_dict.pop(key, None)
+        if is_exceeded is None:
+            try:
+                self._build_tx(config, neon_tx_msg, account_list).validate_size()
+                is_exceeded = False
+            except SolTxSizeError:
+                is_exceeded = True
+
+            if len(self._tx_size_dict) >= self._tx_size_cache_len:
+                self._tx_size_dict.pop(next(iter(self._tx_size_dict)))
+
+        self._tx_size_dict[key] = is_exceeded
+        return is_exceeded
 
 
 class GasEstimate:
+    __slots__ = (
+        '_config', '_sender', '_contract', '_data', '_value', '_gas', '_gas_price',
+        '_data_bytes', '_value_int', '_gas_int', '_core_api_client', '_def_chain_id',
+        '_account_list', '_emulator_result'
+    )
+
     _small_gas_limit = 30_000  # openzeppelin size check
     _tx_builder = _GasTxBuilder()
-    _u256_max = int.from_bytes(bytes([0xFF] * 32), 'big')
+    # Upper bound of the probe tx size without Neon accounts and call data (with compute-budget ixs and NeonTx),
+    #   each Neon account adds 33 bytes: the key and its index in the instruction
+    _probe_tx_base_len = 600
+    _probe_tx_acct_len = 33
+
+    _u256_max_hex = '0x' + 'f' * 64
+
+    # LRU: (sender, contract, chain-id, data, value, block slot) -> emulator result
+    _emulator_result_cache_len = 256
+    _emulator_result_dict: Dict[Tuple[Any, ...], NeonEmulatorResult] = dict()
 
     def __init__(self, config: Config, core_api_client: NeonCoreApiClient, def_chain_id: int):
         self._config = config
@@ -77,6 +154,9 @@ class GasEstimate:
         self._value: Optional[str] = None
         self._gas: Optional[str] = None
         self._gas_price: Optional[str] = None
+        self._data_bytes = bytes()
+        self._value_int = 0
+        self._gas_int = 0
         self._core_api_client = core_api_client
 
         self._def_chain_id = def_chain_id
@@ -96,88 +176,114 @@ class GasEstimate:
             return _value
 
         self._value: Optional[str] = _get_hex('value') or '0x0'
-        self._gas: Optional[str] = _get_hex('gas') or hex(self._u256_max)
+        self._gas: Optional[str] = _get_hex('gas') or self._u256_max_hex
         self._gas_price: Optional[str] = _get_hex('gasPrice')
 
+        self._data_bytes = self._get_data_bytes(self._data)
+        self._value_int = int(self._value, 16)
+        self._gas_int = int(self._gas, 16)
+
+    @staticmethod
+    def _get_data_bytes(data: Optional[str]) -> bytes:
+        if not data:
+            return bytes()
+
+        if data[:2] in {'0x', '0X'}:
+            data = data[2:]
+        if len(data) % 2:
+            raise EthereumError('Invalid data')
+
+        try:
+            data_bytes = bytes.fromhex(data)
+        except ValueError:
+            raise EthereumError('Invalid data')
+
+        # bytes.fromhex() skips whitespaces
+        if len(data_bytes) * 2 != len(data):
+            raise EthereumError('Invalid data')
+        return data_bytes
+
+    def _is_pinned_block(self, block: Optional[SolBlockInfo]) -> bool:
+        # the same logic as in NeonCoreApiClient: only ClickHouse allows to emulate on the state of the slot,
+        #   in other cases the emulator uses the current state of Solana
+        if block is None:
+            return False
+        elif block.sol_commit in {SolCommit.Confirmed, SolCommit.Processed}:
+            return False
+        return len(self._config.ch_dsn_list) > 0
+
     def _execute(self, block: SolBlockInfo, solana_overrides: Optional[SolanaOverrides] = None) -> None:
-        self._emulator_result = self._core_api_client.emulate(
+        if solana_overrides or (not self._is_pinned_block(block)):
+            self._emulator_result = self._emulate(block, solana_overrides)
+            return
+
+        # the emulator uses the state of the block slot, so the result for the same slot is the same,
+        #   the gas limit isn't passed to the emulator, so it isn't a part of the key
+        key = (self._sender, self._contract, self._def_chain_id, self._data, self._value, block.block_slot)
+        cache = self._emulator_result_dict
+        emulator_result = cache.pop(key, None)
+        if emulator_result is None:
+            emulator_result = self._emulate(block, None)
+            if len(cache) >= self._emulator_result_cache_len:
+                cache.pop(next(iter(cache)), None)
+
+        cache[key] = emulator_result
+        self._emulator_result = emulator_result
+
+    def _emulate(self, block: Optional[SolBlockInfo], solana_overrides: Optional[SolanaOverrides]) -> NeonEmulatorResult:
+        return self._core_api_client.emulate(
             self._contract, self._sender, self._def_chain_id, self._data, self._value,
             gas_limit=self._gas, block=block, check_result=True, solana_overrides=solana_overrides,
         )
 
+    def _is_small_tx(self) -> bool:
+        tx_len = (
+            self._probe_tx_base_len +
+            self._probe_tx_acct_len * len(self._account_list) +
+            len(self._data_bytes)
+        )
+        return tx_len <= SolLegacyTx.max_size
+
     def _tx_size_cost(self) -> int:
-        to_addr = self._contract.to_bytes() if self._contract else bytes()
-        data = bytes.fromhex((self._data or '0x')[2:])
-        value = int(self._value, 16)
-        gas = int(self._gas, 16)
+        # the probe tx surely fits into one Solana tx, so there is no need to build it
+        if self._contract and self._is_small_tx() and (self._execution_cost() < self._small_gas_limit):
+            return 0
 
-        if (not value) and (not len(data)):
+        to_addr = self._contract.to_bytes() if self._contract else bytes()
+        value = self._value_int
+        if (not value) and (not len(self._data_bytes)):
             value = 1
 
-        neon_tx = NeonTx(
-            nonce=self._u256_max,
-            gasPrice=self._u256_max,
-            gasLimit=gas,
-            toAddress=to_addr,
-            value=value,
-            callData=data,
-            v=245022934 * 1024 + 35,
-            r=0x1820182018201820182018201820182018201820182018201820182018201820,
-            s=0x1820182018201820182018201820182018201820182018201820182018201820
-        )
+        neon_tx_msg = _encode_probe_neon_tx(self._gas_int, to_addr, value, self._data_bytes)
 
         try:
-            sol_tx = self._tx_builder.build_tx(self._config, neon_tx, self._account_list)
-            sol_tx.serialize()  # <- there will be exception about size
-
-            if not self._contract:  # deploy case
+            if self._tx_builder.is_tx_size_exceeded(self._config, neon_tx_msg, self._account_list):
+                pass
+            elif not self._contract:  # deploy case
                 pass
             elif self._execution_cost() < self._small_gas_limit:
                 return 0
-        except SolTxSizeError:
-            pass
-        except BaseException as exc:
-            LOG.debug('Error during pack solana tx', exc_info=exc)
-
-        return self._holder_tx_cost(self._tx_builder.len_neon_tx)
+        except (ValueError, TypeError) as exc:
+            if LOG.isEnabledFor(logging.DEBUG):
+                LOG.debug('Error during pack solana tx', exc_info=exc)
 
-    @staticmethod
-    def _holder_tx_cost(neon_tx_len: int) -> int:
-        # TODO: should be moved to neon-core-api
-        holder_msg_size = 950
-        return ((neon_tx_len // holder_msg_size) + 1) * 5000
+        # holder tx cost
+        return (len(neon_tx_msg) // _HOLDER_MSG_SIZE + 1) * _PER_CHUNK_FEE
 
     def _execution_cost(self) -> int:
         return self._emulator_result.used_gas
 
-    def _iterative_overhead_cost(self) -> int:
-        if self._config.cu_priority_fee == 0:
-            return 0
-        return 0
-
-        # Can be uncommented when Neon EVM will be ready
-        # # Add priority fee to the estimated gas
-        # iter_cnt = self._emulator_result.iter_cnt
-        #
-        # # Each iteration requests 1'400'000 CUs
-        # # Priority fee is calculated in micro-LAMPORTs per 1 CU
-        # priority_cost = iter_cnt * math.ceil(self._config.cu_priority_fee * 1_400_000 / 1_000_000)
-        # return priority_cost
-
     def _alt_cost(self) -> int:
         """Costs to create->extend->deactivate->close an Address Lookup Table
         """
         # ALT is used by TransactionStepFromAccount, TransactionStepFromAccountNoChainId which have 6 fixed accounts
-        acc_cnt = len(self._account_list) + 5
-        if acc_cnt > ALTLimit.max_tx_account_cnt:
-            return 5000 * 12  # ALT ix: create + ceil(256/30) extend + deactivate + close
-
-        return 0
+        return _ALT_COST if len(self._account_list) + 5 > _ALT_MAX_TX_ACCOUNT_CNT else 0
 
     def _build_account_list(self):
-        self._account_list.clear()
-        for account in self._emulator_result.solana_account_list:
-            self._account_list.append(SolAccountMeta(SolPubKey.from_string(account['pubkey']), False, True))
+        self._account_list = [
+            SolAccountMeta(_get_sol_pubkey(account['pubkey']), False, True)
+            for account in self._emulator_result.solana_account_list
+        ]
 
     def estimate(self, request: Dict[str, Any], block: SolBlockInfo, solana_overrides: Optional[SolanaOverrides] = None):
         self._get_request_param(request)
@@ -186,18 +292,14 @@ class GasEstimate:
 
         execution_cost = self._execution_cost()
         tx_size_cost = self._tx_size_cost()
-        iterative_cost = self._iterative_overhead_cost()
         alt_cost = self._alt_cost()
 
         # Ethereum's wallets don't accept gas limit less than 21000
-        gas = max(execution_cost + tx_size_cost + iterative_cost + alt_cost, 25000)
+        gas = max(execution_cost + tx_size_cost + alt_cost, 25000)
 
         LOG.debug(
-            f'execution_cost: {execution_cost}, '
-            f'tx_size_cost: {tx_size_cost}, '
-            f'iterative_cost: {iterative_cost},'
-            f'alt_cost: {alt_cost}, '
-            f'estimated gas: {gas}'
+            'execution_cost: %d, tx_size_cost: %d, alt_cost: %d, estimated gas: %d',
+            execution_cost, tx_size_cost, alt_cost, gas
         )
 
         return gas
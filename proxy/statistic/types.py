@@ -5,11 +5,11 @@ from aioprometheus.mypy_types import LabelsType, NumericValueType
 
 class PositiveCounter(Counter):
     def add(self, labels: LabelsType, amount: NumericValueType) -> None:
-        try:
-            current = self.get(labels)
-        except KeyError:
-            current = 0
-
-        value = current + amount
-
-        self.set(labels, 0 if value < 0 else value)
+        # MetricDict doesn't override MutableMapping.get(), which raises and catches KeyError on a new label set,
+        #   so the value is read from the underlying dict, and the labels are encoded once for the read and the write
+        key = self.values.__keytransform__(labels)
+        value = self.values.store.get(key, 0) + amount
+
+        if labels:
+            self._check_labels(labels)
+        self.values.store[key] = 0 if value < 0 else value
@@ -0,0 +1,235 @@
+import unittest
+
+import rlp
+
+from unittest.mock import MagicMock, patch
+from typing import Any, Dict, List, Optional
+
+from ..common_neon.config import Config
+from ..common_neon.evm_config import EVMConfig
+from ..common_neon.neon_instruction import NeonIxBuilder
+from ..common_neon.utils.eth_proto import NeonTx
+from ..common_neon.data import NeonEmulatorResult, SolanaOverrides
+from ..common_neon.solana_block import SolBlockInfo
+from ..common_neon.solana_tx import SolCommit, SolPubKey, SolAccountData, SolAccountMeta, SolTxSizeError
+from ..common_neon.solana_tx_legacy import SolLegacyTx
+
+from ..neon_rpc_api_model.estimate import GasEstimate, _encode_probe_neon_tx, _SIGNER
+
+
+class FakeConfig(Config):
+    def __init__(self, ch_dsn_list: List[str], cu_priority_fee: int = 0):
+        super().__init__()
+        self._fake_ch_dsn_list = ch_dsn_list
+        self._fake_cu_priority_fee = cu_priority_fee
+
+    @property
+    def ch_dsn_list(self) -> List[str]:
+        return self._fake_ch_dsn_list
+
+    @property
+    def cu_priority_fee(self) -> int:
+        return self._fake_cu_priority_fee
+
+
+class TestGasEstimateEmulatorCache(unittest.TestCase):
+    _request = {
+        'from': '0x' + '11' * 20,
+        'to': '0x' + '22' * 20,
+        'data': '0x01020304',
+        'value': '0x0',
+        'gas': '0x100000',
+    }
+
+    def setUp(self) -> None:
+        GasEstimate._emulator_result_dict.clear()
+        self.core_api_client = MagicMock()
+        self.core_api_client.emulate.side_effect = lambda *args, **kwargs: NeonEmulatorResult({'used_gas': 123})
+
+    def tearDown(self) -> None:
+        GasEstimate._emulator_result_dict.clear()
+
+    def _execute(self, config: Config, block: Optional[SolBlockInfo],
+                 request: Optional[Dict[str, Any]] = None,
+                 solana_overrides: Optional[SolanaOverrides] = None) -> NeonEmulatorResult:
+        estimator = GasEstimate(config, self.core_api_client, 245022934)
+        estimator._get_request_param(request or self._request)
+        estimator._execute(block, solana_overrides)
+        return estimator._emulator_result
+
+    def test_hit_on_pinned_block(self):
+        config = FakeConfig(['clickhouse://localhost'])
+        block = SolBlockInfo(block_slot=100, sol_commit=SolCommit.Finalized)
+
+        result = self._execute(config, block)
+        self.assertIs(self._execute(config, block), result)
+        self.assertEqual(self.core_api_client.emulate.call_count, 1)
+
+    def test_miss_on_other_request(self):
+        config = FakeConfig(['clickhouse://localhost'])
+        block = SolBlockInfo(block_slot=100, sol_commit=SolCommit.Finalized)
+
+        self._execute(config, block)
+        self._execute(config, SolBlockInfo(block_slot=101, sol_commit=SolCommit.Finalized))
+        self._execute(config, block, dict(self._request, data='0x05'))
+        self._execute(config, block, dict(self._request, value='0x1'))
+        self.assertEqual(self.core_api_client.emulate.call_count, 4)
+
+    def test_hit_on_other_gas(self):
+        # the gas limit doesn't reach the emulator
+        config = FakeConfig(['clickhouse://localhost'])
+        block = SolBlockInfo(block_slot=100, sol_commit=SolCommit.Finalized)
+
+        result = self._execute(config, block)
+        self.assertIs(self._execute(config, block, dict(self._request, gas='0x200000')), result)
+        self.assertEqual(self.core_api_client.emulate.call_count, 1)
+
+    def test_no_cache_on_live_state(self):
+        # the emulator uses the current state of Solana for these blocks
+        case_list = [
+            (FakeConfig(['clickhouse://localhost']), SolBlockInfo(block_slot=100, sol_commit=SolCommit.Confirmed)),
+            (FakeConfig(['clickhouse://localhost']), SolBlockInfo(block_slot=100, sol_commit=SolCommit.Processed)),
+            (FakeConfig([]), SolBlockInfo(block_slot=100, sol_commit=SolCommit.Finalized)),
+            (FakeConfig(['clickhouse://localhost']), None),
+        ]
+        for config, block in case_list:
+            with self.subTest(block=block, ch_dsn_list=config.ch_dsn_list):
+                self.core_api_client.emulate.reset_mock()
+                self._execute(config, block)
+                self._execute(config, block)
+                self.assertEqual(self.core_api_client.emulate.call_count, 2)
+                self.assertEqual(len(GasEstimate._emulator_result_dict), 0)
+
+    def test_bypass_on_overrides(self):
+        config = FakeConfig(['clickhouse://localhost'])
+        block = SolBlockInfo(block_slot=100, sol_commit=SolCommit.Finalized)
+        solana_overrides: SolanaOverrides = {
+            SolPubKey.new_unique(): SolAccountData(lamports=1, owner=SolPubKey.new_unique(), data=bytes(8))
+        }
+
+        self._execute(config, block, solana_overrides=solana_overrides)
+        self._execute(config, block, solana_overrides=solana_overrides)
+        self.assertEqual(self.core_api_client.emulate.call_count, 2)
+        self.assertEqual(len(GasEstimate._emulator_result_dict), 0)
+
+        _, kwargs = self.core_api_client.emulate.call_args
+        self.assertIs(kwargs['solana_overrides'], solana_overrides)
+
+
+class TestProbeNeonTx(unittest.TestCase):
+    _u256_max = (1 << 256) - 1
+
+    @staticmethod
+    def _build_neon_tx(gas_limit: int, to_addr: bytes, value: int, call_data: bytes) -> NeonTx:
+        # the probe NeonTx of the estimator
+        return NeonTx(
+            nonce=TestProbeNeonTx._u256_max,
+            gasPrice=TestProbeNeonTx._u256_max,
+            gasLimit=gas_limit,
+            toAddress=to_addr,
+            value=value,
+            callData=call_data,
+            v=245022934 * 1024 + 35,
+            r=0x1820182018201820182018201820182018201820182018201820182018201820,
+            s=0x1820182018201820182018201820182018201820182018201820182018201820
+        )
+
+    def _get_case_list(self):
+        to_addr = bytes.fromhex('22' * 20)
+        return [
+            (0, to_addr, 0, bytes()),
+            (25000, to_addr, 1, bytes()),
+            (self._u256_max, to_addr, self._u256_max, bytes()),
+            (self._u256_max, bytes(), 1, bytes()),  # deploy
+            (30_000, bytes(), 0, bytes.fromhex('60806040') * 1000),
+            (1, to_addr, 0x7f, bytes([0x01])),  # single byte < 0x80 is encoded without prefix
+            (0x80, to_addr, 0x80, bytes([0x80])),
+            (21000, to_addr, 0, bytes(55)),  # the bound of the short length prefix
+            (21000, to_addr, 0, bytes(56)),
+            (self._u256_max, to_addr, self._u256_max, bytes(range(256)) * 512),
+        ]
+
+    def test_encode_probe_neon_tx(self):
+        for gas_limit, to_addr, value, call_data in self._get_case_list():
+            with self.subTest(gas_limit=gas_limit, to_addr=to_addr.hex(), value=value, data_len=len(call_data)):
+                neon_tx = self._build_neon_tx(gas_limit, to_addr, value, call_data)
+                self.assertEqual(_encode_probe_neon_tx(gas_limit, to_addr, value, call_data), rlp.encode(neon_tx))
+
+    def test_init_neon_tx_msg(self):
+        evm_param_dict = {'NEON_TREASURY_POOL_COUNT': '128', 'NEON_TREASURY_POOL_SEED': 'treasury_pool'}
+        with patch.dict(EVMConfig().evm_param_dict, evm_param_dict):
+            for gas_limit, to_addr, value, call_data in self._get_case_list():
+                with self.subTest(gas_limit=gas_limit, value=value, data_len=len(call_data)):
+                    neon_tx = self._build_neon_tx(gas_limit, to_addr, value, call_data)
+                    tx_builder = NeonIxBuilder(SolPubKey.new_unique()).init_neon_tx(neon_tx)
+                    msg_builder = NeonIxBuilder(SolPubKey.new_unique()).init_neon_tx_msg(rlp.encode(neon_tx))
+
+                    self.assertEqual(msg_builder._msg, tx_builder._msg)
+                    self.assertEqual(msg_builder._neon_tx_sig, tx_builder._neon_tx_sig)
+                    self.assertEqual(msg_builder._neon_tx_sig.hex(), neon_tx.hex_tx_sig[2:])
+                    self.assertEqual(msg_builder._treasury_pool_address, tx_builder._treasury_pool_address)
+
+
+class TestProbeSolTxSize(unittest.TestCase):
+    _u256_max = (1 << 256) - 1
+    _evm_param_dict = {
+        'NEON_TREASURY_POOL_COUNT': '128',
+        'NEON_TREASURY_POOL_SEED': 'treasury_pool',
+        'NEON_EVM_STEPS_MIN': '500'
+    }
+
+    def setUp(self) -> None:
+        self._patcher = patch.dict(EVMConfig().evm_param_dict, self._evm_param_dict)
+        self._patcher.start()
+
+    def tearDown(self) -> None:
+        self._patcher.stop()
+
+    def _get_case_list(self):
+        for cu_priority_fee in (0, 1_000_000):
+            for acct_cnt in (0, 1, 5, 10, 20, 30):
+                for data_len in (0, 4, 100, 300, 600, 900):
+                    yield cu_priority_fee, acct_cnt, data_len
+
+    def _build_tx(self, cu_priority_fee: int, acct_cnt: int, data_len: int) -> SolLegacyTx:
+        config = FakeConfig([], cu_priority_fee)
+        to_addr = bytes.fromhex('22' * 20)
+        neon_tx_msg = _encode_probe_neon_tx(self._u256_max, to_addr, self._u256_max, bytes(data_len))
+        account_list = [SolAccountMeta(SolPubKey.new_unique(), False, True) for _ in range(acct_cnt)]
+        return GasEstimate._tx_builder._build_tx(config, neon_tx_msg, account_list)
+
+    def test_small_tx_bound(self):
+        # the bound of GasEstimate._is_small_tx() should be not less than the real size of the probe tx
+        for cu_priority_fee, acct_cnt, data_len in self._get_case_list():
+            with self.subTest(cu_priority_fee=cu_priority_fee, acct_cnt=acct_cnt, data_len=data_len):
+                tx = self._build_tx(cu_priority_fee, acct_cnt, data_len)
+                tx.sign(_SIGNER)
+                tx_len = len(tx._serialize())
+
+                bound_len = GasEstimate._probe_tx_base_len + GasEstimate._probe_tx_acct_len * acct_cnt + data_len
+                self.assertGreaterEqual(bound_len, tx_len)
+
+    def test_validate_size(self):
+        # validate_size() should calculate the same size as sign() + serialize()
+        for cu_priority_fee, acct_cnt, data_len in self._get_case_list():
+            with self.subTest(cu_priority_fee=cu_priority_fee, acct_cnt=acct_cnt, data_len=data_len):
+                tx = self._build_tx(cu_priority_fee, acct_cnt, data_len)
+                with patch.object(SolLegacyTx, '_check_size') as check_size:
+                    tx.validate_size()
+                    tx.sign(_SIGNER)
+                    tx.serialize()
+
+                (validate_len,), (serialize_len,) = [call.args for call in check_size.call_args_list]
+                self.assertEqual(validate_len, serialize_len)
+                self.assertEqual(serialize_len, len(tx._serialize()))
+
+                is_exceeded = serialize_len > SolLegacyTx.max_size
+                for check in (tx.validate_size, tx.serialize):
+                    if is_exceeded:
+                        self.assertRaises(SolTxSizeError, check)
+                    else:
+                        check()
+
+
+if __name__ == '__main__':
+    unittest.main()
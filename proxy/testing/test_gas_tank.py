@@ -1,7 +1,7 @@
 import unittest
 import base58
 
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 from typing import Optional, Union
 
 from ..common_neon.config import Config, StartSlot
@@ -9,6 +9,7 @@ from ..common_neon.utils import NeonTxInfo
 from ..common_neon.address import NeonAddress
 from ..common_neon.solana_tx import SolPubKey
 from ..common_neon.solana_interactor import SolInteractor
+from ..common_neon.solana_not_empty_block import SolFirstBlockFinder
 from ..common_neon.db.constats_db import ConstantsDB
 
 from ..gas_tank import GasTank
@@ -28,10 +29,12 @@ from ..testing.transactions import (
 
 
 class FakeConfig(Config):
+    _fake_pyth_mapping_account = SolPubKey.new_unique()
+
     def __init__(self, start_slot: str):
         super().__init__()
         self._start_slot = start_slot
-        self._pyth_mapping_account = SolPubKey.new_unique()
+        self._pyth_mapping_account = self._fake_pyth_mapping_account
 
     @property
     def pyth_mapping_account(self) -> Optional[SolPubKey]:
@@ -88,10 +91,13 @@ class TestGasTank(unittest.TestCase):
         """ Should not permit gas-less txs to repeated address """
         gas_tank = self.create_gas_tank(0)
         gas_tank._current_slot = 1
-        self.add_neon_pass_analyzer(gas_tank)
         mock_has_gas_less_tx_permit.side_effect = [True]
 
-        gas_tank._process_sol_tx(neon_pass_tx)
+        # the analysis of NeonPass tx is covered by test_neon_pass_simple_case,
+        #   so the result of the analyzer is passed directly
+        ix_data = base58.b58decode(neon_pass_claim_to_ix_data)
+        neon_tx = NeonTxInfo.from_sig_data(ix_data[5:])
+        gas_tank._allow_gas_less_tx(NeonAddress.from_raw(neon_pass_gas_less_account), neon_tx)
         gas_tank._save_cached_data()
 
         mock_has_gas_less_tx_permit.assert_called_once_with(NeonAddress.from_raw(neon_pass_gas_less_account))
@@ -144,80 +150,54 @@ class TestGasTank(unittest.TestCase):
 
         mock_allow_gas_less_tx.assert_called_once_with(NeonAddress.from_raw(wormhole_gas_less_account), neon_tx)
 
-    @patch.object(ConstantsDB, 'get')
-    @patch.object(SolInteractor, 'get_block_slot')
-    def test_init_gas_tank_slot_continue(self, mock_get_slot, mock_dict_get):
-        start_slot = 1234
-        mock_dict_get.side_effect = [start_slot - 1]
-        mock_get_slot.side_effect = [start_slot + 1]
-
-        new_gas_tank = self.create_gas_tank(StartSlot.Continue)
-
-        self.assertEqual(new_gas_tank._latest_gas_tank_slot, start_slot - 1)
-        mock_get_slot.assert_called_once_with('finalized')
-        mock_dict_get.assert_called()
-
-    @patch.object(ConstantsDB, 'get')
-    @patch.object(SolInteractor, 'get_block_slot')
-    def test_init_gas_tank_slot_continue_recent_slot_not_found(self, mock_get_slot, mock_dict_get):
-        start_slot = 1234
-        mock_dict_get.side_effect = [None]
-        mock_get_slot.side_effect = [start_slot + 1]
-
-        new_gas_tank = self.create_gas_tank(StartSlot.Continue)
 
-        self.assertEqual(new_gas_tank._latest_gas_tank_slot, start_slot + 1)
-        mock_get_slot.assert_called_once_with('finalized')
-        mock_dict_get.assert_called()
+class TestGasTankStartSlot(unittest.TestCase):
+    mock_dict_get: MagicMock
+    mock_get_slot: MagicMock
 
-    @patch.object(ConstantsDB, 'get')
-    @patch.object(SolInteractor, 'get_block_slot')
-    def test_init_gas_tank_start_slot_parse_error(self, mock_get_slot, mock_dict_get):
-        start_slot = 1234
-        mock_dict_get.side_effect = [start_slot - 1]
-        mock_get_slot.side_effect = [start_slot + 1]
-
-        new_gas_tank = self.create_gas_tank('Wrong value')
-
-        self.assertEqual(new_gas_tank._latest_gas_tank_slot, start_slot - 1)
-        mock_get_slot.assert_called_once_with('finalized')
-        mock_dict_get.assert_called()
-
-    @patch.object(ConstantsDB, 'get')
-    @patch.object(SolInteractor, 'get_block_slot')
-    def test_init_gas_tank_slot_latest(self, mock_get_slot, mock_dict_get):
-        start_slot = 1234
-        mock_dict_get.side_effect = [start_slot - 1]
-        mock_get_slot.side_effect = [start_slot + 1]
-
-        new_gas_tank = self.create_gas_tank(StartSlot.Latest)
-
-        self.assertEqual(new_gas_tank._latest_gas_tank_slot, start_slot + 1)
-        mock_get_slot.assert_called_once_with('finalized')
-        mock_dict_get.assert_called()
+    @classmethod
+    def _start_patcher(cls, target, attribute: str, **kwargs) -> MagicMock:
+        patcher = patch.object(target, attribute, **kwargs)
+        cls.addClassCleanup(patcher.stop)
+        return patcher.start()
 
-    @patch.object(ConstantsDB, 'get')
-    @patch.object(SolInteractor, 'get_block_slot')
-    def test_init_gas_tank_slot_number(self, mock_get_slot, mock_dict_get):
-        start_slot = 1234
-        mock_dict_get.side_effect = [start_slot - 1]
-        mock_get_slot.side_effect = [start_slot + 1]
+    @classmethod
+    def setUpClass(cls):
+        # the same patchers are used by all tests, they are started once for the class
+        cls.mock_dict_get = cls._start_patcher(ConstantsDB, 'get')
+        cls.mock_get_slot = cls._start_patcher(SolInteractor, 'get_block_slot')
 
-        new_gas_tank = self.create_gas_tank(start_slot)
+        # GasTank doesn't send requests to Solana on start:
+        #   the history of Solana is empty, so the first slot with a block is 0
+        cls._start_patcher(SolInteractor, 'get_first_available_slot', return_value=0)
+        cls._start_patcher(SolFirstBlockFinder, 'find_slot', return_value=0)
 
-        self.assertEqual(new_gas_tank._latest_gas_tank_slot, start_slot)
-        mock_get_slot.assert_called_once_with('finalized')
-        mock_dict_get.assert_called()
+    @staticmethod
+    def create_gas_tank(start_slot: Union[str, int]) -> GasTank:
+        return GasTank(config=FakeConfig(start_slot))
 
-    @patch.object(ConstantsDB, 'get')
-    @patch.object(SolInteractor, 'get_block_slot')
-    def test_init_gas_tank_big_slot_number(self, mock_get_slot, mock_dict_get):
+    def test_init_gas_tank_start_slot(self):
         start_slot = 1234
-        mock_dict_get.side_effect = [start_slot - 1]
-        mock_get_slot.side_effect = [start_slot + 1]
-
-        new_gas_tank = self.create_gas_tank(start_slot + 100)
-
-        self.assertEqual(new_gas_tank._latest_gas_tank_slot, start_slot + 1)
-        mock_get_slot.assert_called_once_with('finalized')
-        mock_dict_get.assert_called()
+        finalized_slot = start_slot + 1
+        # start slot in config, last known slot in DB, expected start slot
+        case_list = [
+            (StartSlot.Continue, start_slot - 1, start_slot - 1),
+            (StartSlot.Continue, None, finalized_slot),
+            ('Wrong value', start_slot - 1, start_slot - 1),
+            (StartSlot.Latest, start_slot - 1, finalized_slot),
+            (start_slot, start_slot - 1, start_slot),
+            (start_slot + 100, start_slot - 1, finalized_slot),
+        ]
+
+        for cfg_start_slot, last_known_slot, expected_start_slot in case_list:
+            with self.subTest(start_slot=cfg_start_slot, last_known_slot=last_known_slot):
+                self.mock_dict_get.reset_mock()
+                self.mock_get_slot.reset_mock()
+                self.mock_dict_get.side_effect = [last_known_slot]
+                self.mock_get_slot.side_effect = [finalized_slot]
+
+                new_gas_tank = self.create_gas_tank(cfg_start_slot)
+
+                self.assertEqual(new_gas_tank._latest_gas_tank_slot, expected_start_slot)
+                self.mock_get_slot.assert_called_once_with('finalized')
+                self.mock_dict_get.assert_called()
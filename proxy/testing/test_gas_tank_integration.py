@@ -1,16 +1,16 @@
+import itertools
 import json
+import os
+import threading
 import unittest
 
-from time import sleep
+from functools import partial
 from unittest import TestCase
-from typing import Dict, Any
+from typing import Dict, Any, List, Union, Tuple, Iterator
 
-from solana.rpc.api import Client as RPCSolClient
-from solana.rpc.commitment import Confirmed as RPCSolConfirmed
 from solders.system_program import ID as SYS_PROGRAM_ID
 
 from spl.token.client import Token as SplToken
-from spl.token._layouts import ACCOUNT_LAYOUT
 from spl.token.constants import TOKEN_PROGRAM_ID
 import spl.token.instructions as SplTokenIxs
 
@@ -18,16 +18,41 @@ from proxy.common_neon.metaplex import create_metadata_instruction_data, create_
 from proxy.common_neon.solana_tx import SolAccountMeta, SolTxIx, SolAccount, SolPubKey, SolAccountData
 from proxy.common_neon.neon_instruction import NeonIxBuilder
 from proxy.common_neon.erc20_wrapper import ERC20Wrapper
+from proxy.common_neon.data import SolanaOverrides
 from proxy.common_neon.config import Config
 from proxy.common_neon.constants import EVM_PROGRAM_ID
 from proxy.common_neon.solana_tx_legacy import SolLegacyTx
 
-from proxy.testing.testing_helpers import Proxy, SolClient, NeonLocalAccount
+from proxy.testing.testing_helpers import Proxy, SolClient, NeonLocalAccount, poll_until, run_parallel
 
 
 MAX_ZERO_GAS_PRICE_WAIT_TIME = 15
+MINT_AMOUNT = 1000_000_000_000
+MIN_MINT_AUTHORITY_BALANCE = 100_000_000_000
+SOL_ACCOUNT_BALANCE = 1000_000_000_000
+MIN_SOL_ACCOUNT_BALANCE = 100_000_000_000
 NAME = 'TestToken'
 SYMBOL = 'TST'
+_TRUE_VALUE_LIST = ('YES', 'ON', 'TRUE', '1')
+# print details about created accounts
+VERBOSE = os.environ.get('GAS_TANK_TEST_VERBOSE', 'NO').upper().strip() in _TRUE_VALUE_LIST
+# reuse the token mint and the ERC20 wrapper by all test classes in the process
+REUSE_MINT = os.environ.get('NEON_TEST_REUSE_MINT', 'NO').upper().strip() in _TRUE_VALUE_LIST
+# reuse Solana accounts with SOLs from the previous test runs
+REUSE_ACCOUNTS = os.environ.get('NEON_TEST_REUSE_ACCOUNTS', 'NO').upper().strip() in _TRUE_VALUE_LIST
+
+# Offsets of fields in ACCOUNT_LAYOUT of SPL token account:
+#   mint(32), owner(32), amount(8), delegate_option(4), delegate(32), state(1),
+#   is_native_option(4), is_native(8), delegated_amount(8), ...
+_AMOUNT_OFFSET = 64
+_DELEGATE_OPTION_OFFSET = 72
+_DELEGATE_OFFSET = 76
+_DELEGATED_AMOUNT_OFFSET = 121
+
+# token name -> SPL token mint and ERC20 wrapper, which are shared by test classes
+_shared_token_dict: Dict[str, SplToken] = dict()
+_shared_erc20_dict: Dict[str, ERC20Wrapper] = dict()
+_shared_lock = threading.Lock()
 
 
 class FakeConfig(Config):
@@ -44,7 +69,10 @@ class TestGasTankIntegration(TestCase):
     mint_authority: SolAccount
     token: SplToken
     erc20_for_spl: ERC20Wrapper
-    solana: SolClient
+    from_owner: SolAccount
+    from_spl_token_acc: SolPubKey
+    acc_num: Iterator[int]
+    compute_budget_ix_list: List[SolTxIx]
 
     @classmethod
     def setUpClass(cls):
@@ -52,39 +80,58 @@ class TestGasTankIntegration(TestCase):
         cls.admin = cls.proxy.create_signer_account('neonlabsorg/proxy-model.py/issues/344/admin20')
         cls.config = FakeConfig()
         cls.solana = SolClient(cls.config)
-        cls.create_token_mint()
-        cls.deploy_erc20_for_spl()
-        cls.acc_num = 0
+        with _shared_lock:
+            cls.create_token_mint()
+            cls.deploy_erc20_for_spl()
+        # next() on the counter is atomic, so tests can create accounts from several threads
+        cls.acc_num = itertools.count(1)
         cls.neon_ix_builder = NeonIxBuilder(cls.mint_authority)
+        cls.compute_budget_ix_list = [
+            cls.neon_ix_builder.make_compute_budget_heap_ix(),
+            cls.neon_ix_builder.make_compute_budget_cu_ix()
+        ]
+
+        # the source of SPL tokens is shared between tests, each test checks the change of its balance
+        cls.from_owner = cls.create_sol_account()
+        cls.from_spl_token_acc = cls.create_token_account(cls.from_owner.pubkey(), MINT_AMOUNT)
 
     @classmethod
     def create_token_mint(cls):
-        sol_client = RPCSolClient(Config().random_solana_url, commitment=RPCSolConfirmed)
-
         with open("proxy/operator-keypairs/id2.json") as f:
             d = json.load(f)
         cls.mint_authority = SolAccount.from_bytes(bytes(d))
         print('Account: ', cls.mint_authority.pubkey())
-        cls.solana.request_airdrop(cls.mint_authority.pubkey(), 1000_000_000_000)
-        for i in range(20):
-            sleep(1)
-            balance = cls.solana.get_sol_balance(cls.mint_authority.pubkey())
-            if balance == 0:
-                continue
-
-        cls.token = SplToken.create_mint(
-            sol_client,
-            cls.mint_authority,
-            cls.mint_authority.pubkey(),
-            9,
-            TOKEN_PROGRAM_ID,
-        )
-        print(
-            'create_token_mint mint, SolanaAccount: ',
-            cls.solana.get_account_info(cls.mint_authority.pubkey())
-        )
 
-        print(f'Created new token mint: {cls.token.pubkey}')
+        # with REUSE_MINT the mint is created once per test process and is shared by all test classes
+        token = _shared_token_dict.get(NAME, None) if REUSE_MINT else None
+        if token is not None:
+            cls.token = token
+            print(f'Reuse token mint: {cls.token.pubkey}')
+            return
+
+        # the mint authority has the constant keypair, so the repeated runs don't need the airdrop
+        if cls.solana.get_sol_balance(cls.mint_authority.pubkey()) < MIN_MINT_AUTHORITY_BALANCE:
+            tx_sig = cls.solana.request_airdrop(cls.mint_authority.pubkey(), 1000_000_000_000)
+            assert tx_sig is not None, 'Fail to request airdrop'
+            assert cls.solana.confirm_tx_sig(tx_sig), f'Airdrop {tx_sig} is not confirmed'
+
+        # one more attempt in case of a transient RPC error
+        retry_on_fail = 2
+        for retry in range(retry_on_fail):
+            try:
+                cls.token = SplToken.create_mint(
+                    cls.solana.raw_client,
+                    cls.mint_authority,
+                    cls.mint_authority.pubkey(),
+                    9,
+                    TOKEN_PROGRAM_ID,
+                )
+                break
+            except Exception as exc:
+                if retry + 1 == retry_on_fail:
+                    raise RuntimeError(f'Fail to create token mint: {exc}') from exc
+                print(f'Fail to create token mint, retry: {exc}')
+        print(f'Created new token mint: {cls.token.pubkey}, mint authority: {cls.mint_authority.pubkey()}')
 
         metadata = create_metadata_instruction_data(NAME, SYMBOL)
         tx = SolLegacyTx(
@@ -100,9 +147,15 @@ class TestGasTankIntegration(TestCase):
             ]
         )
         cls.solana.send_tx(tx, cls.mint_authority)
+        _shared_token_dict[NAME] = cls.token
 
     @classmethod
     def deploy_erc20_for_spl(cls):
+        erc20_for_spl = _shared_erc20_dict.get(NAME, None) if REUSE_MINT else None
+        if (erc20_for_spl is not None) and (erc20_for_spl.token.pubkey == cls.token.pubkey):
+            cls.erc20_for_spl = erc20_for_spl
+            return
+
         cls.erc20_for_spl = ERC20Wrapper(
             cls.proxy.web3,
             NAME,
@@ -112,104 +165,180 @@ class TestGasTankIntegration(TestCase):
             cls.mint_authority
         )
         cls.erc20_for_spl.deploy_wrapper()
+        _shared_erc20_dict[NAME] = cls.erc20_for_spl
 
     @classmethod
-    def create_account_instruction(cls, neon_address: str, payer: SolPubKey):
-        neon_ix_builder = NeonIxBuilder(payer)
+    def create_account_instruction(cls, neon_address: str, payer: SolPubKey) -> SolTxIx:
         acct_info = cls.proxy.get_account_info(neon_address)
-        return neon_ix_builder.make_create_neon_account_ix(acct_info)
+        return NeonIxBuilder(payer).make_create_neon_account_ix(acct_info)
+
+    @classmethod
+    def create_sol_account(cls):
+        if REUSE_ACCOUNTS:
+            return cls.solana.acquire_funded_account(MIN_SOL_ACCOUNT_BALANCE, SOL_ACCOUNT_BALANCE)
 
-    def create_sol_account(self):
         account = SolAccount()
-        print(f"New solana account created: {account.pubkey()}. Airdropping SOL...")
-        self.solana.request_airdrop(account.pubkey(), 1000_000_000_000)
+        if VERBOSE:
+            print(f"New solana account created: {account.pubkey()}. Airdropping SOL...")
+        cls.solana.request_airdrop(account.pubkey(), SOL_ACCOUNT_BALANCE)
         return account
 
-    def create_token_account(self, owner: SolPubKey, mint_amount: int):
-        new_token_account = self.erc20_for_spl.create_associated_token_account(owner)
-        print(f'associated token account: {new_token_account}')
-        self.erc20_for_spl.mint_to(new_token_account, mint_amount)
+    @classmethod
+    def create_token_account(cls, owner: SolPubKey, mint_amount: int) -> SolPubKey:
+        new_token_account = SplTokenIxs.get_associated_token_address(owner, cls.token.pubkey)
+        if VERBOSE:
+            print(f'associated token account: {new_token_account}')
+
+        # the mint authority pays for the account and mints tokens in the same tx
+        tx = SolLegacyTx(
+            name='CreateTokenAccount',
+            ix_list=[
+                SplTokenIxs.create_associated_token_account(
+                    payer=cls.mint_authority.pubkey(),
+                    owner=owner,
+                    mint=cls.token.pubkey
+                ),
+                SplTokenIxs.mint_to(SplTokenIxs.MintToParams(
+                    program_id=cls.token.program_id,
+                    mint=cls.token.pubkey,
+                    dest=new_token_account,
+                    mint_authority=cls.mint_authority.pubkey(),
+                    amount=mint_amount,
+                    signers=[],
+                ))
+            ]
+        )
+        cls.solana.send_tx(tx, cls.mint_authority)
         return new_token_account
 
     def create_neon_account(self):
-        self.acc_num += 1
-        neon_acct = self.proxy.create_account(f'neonlabsorg/proxy-model.py/issues/344/eth_account{self.acc_num}')
-        print(f"NEON account created: {neon_acct.address}")
+        acc_num = next(self.acc_num)
+        neon_acct = self.proxy.create_account(f'neonlabsorg/proxy-model.py/issues/344/eth_account{acc_num}')
+        if VERBOSE:
+            print(f"NEON account created: {neon_acct.address}")
         return neon_acct
 
-    def build_tx(self, name: str, ix_list) -> SolLegacyTx:
-        return SolLegacyTx(
-            name=name,
-            ix_list=[
-                self.neon_ix_builder.make_compute_budget_heap_ix(),
-                self.neon_ix_builder.make_compute_budget_cu_ix()
-            ] + ix_list
+    def get_spl_balance_list(self, spl_token_acc_list: List[SolPubKey]) -> List[int]:
+        # SolInteractor packs addresses into getMultipleAccounts requests, only the head with the amount is read
+        account_list = self.solana.get_account_info_list(spl_token_acc_list, length=_AMOUNT_OFFSET + 8)
+        return [
+            int.from_bytes(account.data[_AMOUNT_OFFSET:_AMOUNT_OFFSET + 8], 'little') if account is not None else 0
+            for account in account_list
+        ]
+
+    def get_balance_list(self, *address_list: Union[SolPubKey, str]) -> List[int]:
+        # SPL token balances are read with getMultipleAccounts requests,
+        #   ERC20 balances of Neon accounts are eth_calls, all requests are sent in parallel
+        spl_acct_list = [address for address in address_list if isinstance(address, SolPubKey)]
+        neon_acct_list = [address for address in address_list if not isinstance(address, SolPubKey)]
+        spl_balance_list, *neon_balance_list = run_parallel(
+            partial(self.get_spl_balance_list, spl_acct_list),
+            *[partial(self.erc20_for_spl.get_balance, address) for address in neon_acct_list]
         )
 
+        spl_balance_iter, neon_balance_iter = iter(spl_balance_list), iter(neon_balance_list)
+        return [
+            next(spl_balance_iter) if isinstance(address, SolPubKey) else next(neon_balance_iter)
+            for address in address_list
+        ]
+
+    def build_tx(self, name: str, ix_list) -> SolLegacyTx:
+        return SolLegacyTx(name=name, ix_list=self.compute_budget_ix_list + ix_list)
+
     def neon_gas_price_impl(self, param: Dict[str, Any]) -> int:
-        gas_price = self.proxy.web3.neon.neon_gasPrice(param)
-        return int(gas_price.gasPrice[2:], 16)
+        gas_price = self.proxy.web3.neon.neon_gasPrice(param).gasPrice
+        if isinstance(gas_price, int):
+            return gas_price
+        return int(gas_price, 16)
 
-    def neon_gas_price(self, account: str) -> int:
+    def neon_gas_price_quick(self, account: str) -> int:
         gas = 1_000_000
-        big_gas = 30_000_000
-
         gas_price = self.neon_gas_price_impl({'from': account, 'gas': gas})
-        print(f'neon_gasPrice(from={account}, gas={gas}) = {gas_price}')
-        if gas_price != 0:
-            return gas_price
+        if VERBOSE:
+            print(f'neon_gasPrice(from={account}, gas={gas}) = {gas_price}')
+        return gas_price
+
+    def neon_gas_price_verify(self, account: str) -> None:
+        gas = 1_000_000
+        big_gas = 30_000_000
 
         big_nonce = 6
+        param_list: List[Dict[str, Any]] = list()
         for nonce in range(0, big_nonce):
-            zero_gas_price = self.neon_gas_price_impl({'from': account, 'nonce': nonce, 'gas': gas})
-            self.assertEqual(zero_gas_price, 0)
+            param_list.append({'from': account, 'nonce': nonce, 'gas': gas})
+            param_list.append({'from': account, 'nonce': nonce, 'gas': big_gas})
+        param_list.append({'from': account, 'nonce': big_nonce, 'gas': gas})
+        param_list.append({'from': account, 'nonce': big_nonce, 'gas': big_gas})
 
-            big_gas_price = self.neon_gas_price_impl({'from': account, 'nonce': nonce, 'gas': big_gas})
+        gas_price_list = self.proxy.neon_gas_price_batch(param_list)
+        for nonce in range(0, big_nonce):
+            zero_gas_price, big_gas_price = gas_price_list[nonce * 2], gas_price_list[nonce * 2 + 1]
+            self.assertEqual(zero_gas_price, 0)
             self.assertNotEqual(big_gas_price, 0)
 
-        big_gas_price = self.neon_gas_price_impl({'from': account, 'nonce': big_nonce, 'gas': gas})
-        self.assertNotEqual(big_gas_price, 0)
-
-        big_gas_price = self.neon_gas_price_impl({'from': account, 'nonce': big_nonce, 'gas': big_gas})
-        self.assertNotEqual(big_gas_price, 0)
-
-        return gas_price
-    
-    def get_spl_token_account_with_approve(self, spl_token_acc: SolPubKey, delegate: SolPubKey, transfer_amount: int):
-        account = self.solana.get_account_info(spl_token_acc)
-        data = ACCOUNT_LAYOUT.parse(account.data)
-        data.delegate_option = 1
-        data.delegate = bytes(delegate)
-        data.delegated_amount = transfer_amount
-        return SolAccountData(
-            lamports=account.lamports,
-            owner=account.owner,
-            data=ACCOUNT_LAYOUT.build(data)
-        )
+        self.assertNotEqual(gas_price_list[-2], 0)
+        self.assertNotEqual(gas_price_list[-1], 0)
+
+    def wait_for_gas_less(self, *account_list: str, timeout_sec: float = MAX_ZERO_GAS_PRICE_WAIT_TIME) -> bool:
+        # only the cheap probe is polled, the full check of the gas-less permissions is done once,
+        #   accounts are independent, so they are probed in parallel
+        def _is_gas_less() -> bool:
+            gas_price_list = run_parallel(*[partial(self.neon_gas_price_quick, account) for account in account_list])
+            return all(gas_price == 0 for gas_price in gas_price_list)
+
+        if not poll_until(_is_gas_less, timeout_sec, initial=0.2):
+            return False
+
+        run_parallel(*[partial(self.neon_gas_price_verify, account) for account in account_list])
+        return True
+
+    def get_spl_token_overrides_with_approve(self,
+                                             approve_list: List[Tuple[SolPubKey, SolPubKey, int]]) -> SolanaOverrides:
+        # all SPL token accounts are fetched with one getMultipleAccounts request
+        account_list = self.solana.get_account_info_list([spl_token_acc for spl_token_acc, _, _ in approve_list])
+
+        overrides: SolanaOverrides = dict()
+        for (spl_token_acc, delegate, transfer_amount), account in zip(approve_list, account_list):
+            # patch the delegate fields in place, instead of the parse->build of the whole layout
+            data = bytearray(account.data)
+            data[_DELEGATE_OPTION_OFFSET:_DELEGATE_OFFSET] = (1).to_bytes(4, 'little')
+            data[_DELEGATE_OFFSET:_DELEGATE_OFFSET + 32] = bytes(delegate)
+            data[_DELEGATED_AMOUNT_OFFSET:_DELEGATED_AMOUNT_OFFSET + 8] = transfer_amount.to_bytes(8, 'little')
+            overrides[spl_token_acc] = SolAccountData(
+                lamports=account.lamports,
+                owner=account.owner,
+                data=bytes(data)
+            )
+        return overrides
 
     def test_success_gas_less_simple_case(self):
-        from_owner = self.create_sol_account()
-        mint_amount = 1000_000_000_000
-        from_spl_token_acc = self.create_token_account(from_owner.pubkey(), mint_amount)
+        from_owner = self.from_owner
+        from_spl_token_acc = self.from_spl_token_acc
         signer_acct = self.create_neon_account()
         to_neon_acct = self.create_neon_account()
+        auth_acct = self.erc20_for_spl.get_auth_account_address(signer_acct.address)
 
         print(f'        OWNER {from_owner.pubkey()}')
         print(f'            SPL TOKEN ACC {from_spl_token_acc}')
 
-        self.assertEqual(self.erc20_for_spl.get_balance(from_spl_token_acc), mint_amount)
-        self.assertEqual(self.erc20_for_spl.get_balance(to_neon_acct.address), 0)
+        from_balance, to_balance = self.get_balance_list(from_spl_token_acc, to_neon_acct.address)
+        self.assertEqual(to_balance, 0)
 
         transfer_amount = 123456
+        create_signer_ix, create_to_ix, overrides = run_parallel(
+            lambda: self.create_account_instruction(signer_acct.address, from_owner.pubkey()),
+            lambda: self.create_account_instruction(to_neon_acct.address, from_owner.pubkey()),
+            lambda: self.get_spl_token_overrides_with_approve([(from_spl_token_acc, auth_acct, transfer_amount)])
+        )
         tx = self.build_tx(
             name='SimpleCase',
             ix_list=[
-                self.create_account_instruction(signer_acct.address, from_owner.pubkey()),
-                self.create_account_instruction(to_neon_acct.address, from_owner.pubkey()),
+                create_signer_ix,
+                create_to_ix,
                 SplTokenIxs.approve(SplTokenIxs.ApproveParams(
                     program_id=self.token.program_id,
                     source=from_spl_token_acc,
-                    delegate=self.erc20_for_spl.get_auth_account_address(signer_acct.address),
+                    delegate=auth_acct,
                     owner=from_owner.pubkey(),
                     amount=transfer_amount,
                     signers=[],
@@ -220,45 +349,33 @@ class TestGasTankIntegration(TestCase):
                     to_acct=to_neon_acct,
                     amount=transfer_amount,
                     signer_acct=signer_acct,
-                    overrides={
-                        from_spl_token_acc: self.get_spl_token_account_with_approve(
-                            from_spl_token_acc,
-                            self.erc20_for_spl.get_auth_account_address(signer_acct.address),
-                            transfer_amount
-                        ),
-                    }
+                    overrides=overrides
                 ).make_tx_exec_from_data_ix()
             ]
         )
-        self.solana.send_tx(tx, from_owner)
-
-        self.assertEqual(self.erc20_for_spl.get_balance(from_spl_token_acc), mint_amount - transfer_amount)
-        self.assertEqual(self.erc20_for_spl.get_balance(to_neon_acct.address), transfer_amount)
+        self.solana.send_tx(tx, from_owner, skip_preflight=True)
 
-        gas_price = 1
-        wait_time = 0
-        while wait_time < MAX_ZERO_GAS_PRICE_WAIT_TIME:
-            gas_price = self.neon_gas_price(to_neon_acct.address)
-            if gas_price == 0:
-                return
+        self.assertEqual(
+            self.get_balance_list(from_spl_token_acc, to_neon_acct.address),
+            [from_balance - transfer_amount, transfer_amount]
+        )
 
-            sleep(1)
-            wait_time += 1
-        print(f"Wait time for simple SolLegacyTx (1 zero-gas-price): {wait_time}")
-        self.assertEqual(gas_price, 0)
+        self.assertTrue(self.wait_for_gas_less(to_neon_acct.address))
 
     @unittest.skip('SolTx is too big')
     def test_success_gas_less_complex_case(self):
-        from_owner = self.create_sol_account()
-        mint_amount = 1000_000_000_000
-        from_spl_token_acct = self.create_token_account(from_owner.pubkey(), mint_amount)
+        from_owner = self.from_owner
+        from_spl_token_acct = self.from_spl_token_acc
         to_neon_acct1 = self.create_neon_account()
         to_neon_acct2 = self.create_neon_account()
         signer_acct = self.create_neon_account()
+        auth_acct = self.erc20_for_spl.get_auth_account_address(signer_acct.address)
 
-        self.assertEqual(self.erc20_for_spl.get_balance(from_spl_token_acct), mint_amount)
-        self.assertEqual(self.erc20_for_spl.get_balance(to_neon_acct1.address), 0)
-        self.assertEqual(self.erc20_for_spl.get_balance(to_neon_acct2.address), 0)
+        from_balance, to_balance1, to_balance2 = self.get_balance_list(
+            from_spl_token_acct, to_neon_acct1.address, to_neon_acct2.address
+        )
+        self.assertEqual(to_balance1, 0)
+        self.assertEqual(to_balance2, 0)
 
         tx = self.build_tx(
             name='CreateSignerComplexCase',
@@ -266,19 +383,23 @@ class TestGasTankIntegration(TestCase):
                 self.create_account_instruction(signer_acct.address, from_owner.pubkey()),
             ]
         )
-        self.solana.send_tx(tx, from_owner)
+        self.solana.send_tx(tx, from_owner, skip_preflight=True)
 
         transfer_amount1 = 123456
         transfer_amount2 = 654321
+        create_to_ix1, create_to_ix2 = run_parallel(
+            lambda: self.create_account_instruction(to_neon_acct1.address, from_owner.pubkey()),
+            lambda: self.create_account_instruction(to_neon_acct2.address, from_owner.pubkey())
+        )
         tx = self.build_tx(
             name='ComplexCase',
             ix_list=[
-                self.create_account_instruction(to_neon_acct1.address, from_owner.pubkey()),
-                self.create_account_instruction(to_neon_acct2.address, from_owner.pubkey()),
+                create_to_ix1,
+                create_to_ix2,
                 SplTokenIxs.approve(SplTokenIxs.ApproveParams(
                     program_id=self.token.program_id,
                     source=from_spl_token_acct,
-                    delegate=self.erc20_for_spl.get_auth_account_address(signer_acct.address),
+                    delegate=auth_acct,
                     owner=from_owner.pubkey(),
                     amount=transfer_amount1+transfer_amount2,
                     signers=[],
@@ -301,58 +422,48 @@ class TestGasTankIntegration(TestCase):
                 ).make_tx_exec_from_data_ix()
             ]
         )
-        self.solana.send_tx(tx, from_owner)
+        self.solana.send_tx(tx, from_owner, skip_preflight=True)
 
         self.assertEqual(
-            self.erc20_for_spl.get_balance(from_spl_token_acct),
-            mint_amount - transfer_amount1 - transfer_amount2
+            self.get_balance_list(from_spl_token_acct, to_neon_acct1.address, to_neon_acct2.address),
+            [from_balance - transfer_amount1 - transfer_amount2, transfer_amount1, transfer_amount2]
         )
-        self.assertEqual(self.erc20_for_spl.get_balance(to_neon_acct1.address), transfer_amount1)
-        self.assertEqual(self.erc20_for_spl.get_balance(to_neon_acct2.address), transfer_amount2)
-
-        gas_price1 = 1
-        gas_price2 = 2
-        wait_time = 0
-        while wait_time < MAX_ZERO_GAS_PRICE_WAIT_TIME:
-            gas_price1 = self.neon_gas_price(to_neon_acct1.address)
-            gas_price2 = self.neon_gas_price(to_neon_acct2.address)
-            if (gas_price1 == 0) and (gas_price2 == 0):
-                return
-
-            sleep(1)
-            wait_time += 1
 
-        print(f"Wait time for complex SolLegacyTx (2 gas-less): {wait_time}")
-        self.assertEqual(gas_price1, 0)
-        self.assertEqual(gas_price2, 0)
+        self.assertTrue(self.wait_for_gas_less(to_neon_acct1.address, to_neon_acct2.address))
 
     def test_no_gas_less_tx(self):
-        from_owner = self.create_sol_account()
-        mint_amount = 1000_000_000_000
-        from_spl_token_acc = self.create_token_account(from_owner.pubkey(), mint_amount)
+        from_owner = self.from_owner
+        from_spl_token_acc = self.from_spl_token_acc
         to_neon_acct = self.create_neon_account()
         signer_acct = self.create_neon_account()
+        auth_acct = self.erc20_for_spl.get_auth_account_address(signer_acct.address)
 
         initial_balance = 1_000
         # Create account before input liquidity (should not cause gas-less tx)
         self.proxy.request_airdrop(to_neon_acct.address, initial_balance)
-        sleep(2)
+        # Destination-acc Neon balance is initial
+        self.assertTrue(poll_until(
+            lambda: self.proxy.conn.get_balance(to_neon_acct.address) == initial_balance * 10**18,
+            20
+        ))
 
-        self.assertEqual(self.erc20_for_spl.get_balance(from_spl_token_acc), mint_amount)
         # Destination-acc ERC20-Token balance is 0
-        self.assertEqual(self.erc20_for_spl.get_balance(to_neon_acct.address), 0)
-        # Destination-acc Neon balance is initial
-        self.assertEqual(self.proxy.conn.get_balance(to_neon_acct.address), initial_balance * 10**18)
+        from_balance, to_balance = self.get_balance_list(from_spl_token_acc, to_neon_acct.address)
+        self.assertEqual(to_balance, 0)
 
         transfer_amount = 123456
+        create_signer_ix, overrides = run_parallel(
+            lambda: self.create_account_instruction(signer_acct.address, from_owner.pubkey()),
+            lambda: self.get_spl_token_overrides_with_approve([(from_spl_token_acc, auth_acct, transfer_amount)])
+        )
         tx = self.build_tx(
             name='NoGasTankAllowance',
             ix_list=[
-                self.create_account_instruction(signer_acct.address, from_owner.pubkey()),
+                create_signer_ix,
                 SplTokenIxs.approve(SplTokenIxs.ApproveParams(
                     program_id=self.token.program_id,
                     source=from_spl_token_acc,
-                    delegate=self.erc20_for_spl.get_auth_account_address(signer_acct.address),
+                    delegate=auth_acct,
                     owner=from_owner.pubkey(),
                     amount=transfer_amount,
                     signers=[],
@@ -363,40 +474,31 @@ class TestGasTankIntegration(TestCase):
                     to_acct=to_neon_acct,
                     amount=transfer_amount,
                     signer_acct=signer_acct,
-                    overrides={
-                        from_spl_token_acc: self.get_spl_token_account_with_approve(
-                            from_spl_token_acc,
-                            self.erc20_for_spl.get_auth_account_address(signer_acct.address),
-                            transfer_amount
-                        ),
-                    }
+                    overrides=overrides
                 ).make_tx_exec_from_data_ix()
             ]
         )
 
-        self.solana.send_tx(tx, from_owner)
-
-        wait_time = 0
-        while wait_time < MAX_ZERO_GAS_PRICE_WAIT_TIME:
-            gas_price = self.neon_gas_price(to_neon_acct.address)
-            if gas_price == 0:
-                break
-
-            sleep(1)
-            wait_time += 1
+        self.solana.send_tx(tx, from_owner, skip_preflight=True)
 
-        self.assertEqual(self.erc20_for_spl.get_balance(from_spl_token_acc), mint_amount - transfer_amount)
-        self.assertEqual(self.erc20_for_spl.get_balance(to_neon_acct.address), transfer_amount)
+        self.assertEqual(
+            self.get_balance_list(from_spl_token_acc, to_neon_acct.address),
+            [from_balance - transfer_amount, transfer_amount]
+        )
 
-        gas_price = self.neon_gas_price(to_neon_acct.address)
-        self.assertNotEqual(gas_price, 0)
+        # the indexer needs time to process the tx, so wait for a possible gas-less state with a bounded timeout
+        self.assertFalse(poll_until(
+            lambda: self.neon_gas_price_quick(to_neon_acct.address) == 0,
+            MAX_ZERO_GAS_PRICE_WAIT_TIME,
+            initial=0.2
+        ))
 
     @unittest.skip('claimTo fails SolTx')
     def test_failed_gas_less_tx(self):
         """Should fail because approve is given to wrong account"""
-        from_owner = self.create_sol_account()
-        mint_amount = 1000_000_000_000
-        from_spl_token_acc = self.create_token_account(from_owner.pubkey(), mint_amount)
+        from_owner = self.from_owner
+        from_spl_token_acc = self.from_spl_token_acc
+        from_balance = self.erc20_for_spl.get_balance(from_spl_token_acc)
         signer_acct = self.create_neon_account()
         to_neon_acct = self.create_neon_account()
 
@@ -425,16 +527,10 @@ class TestGasTankIntegration(TestCase):
         )
         self.solana.send_tx(tx, from_owner, skip_preflight=True)
 
-        self.assertEqual(self.erc20_for_spl.get_balance(from_spl_token_acc), mint_amount)
-        self.assertEqual(self.erc20_for_spl.get_balance(to_neon_acct.address), 0)
-
-        gas_price = 1
-        wait_time = 0
-        while wait_time < MAX_ZERO_GAS_PRICE_WAIT_TIME:
-            gas_price = self.neon_gas_price(to_neon_acct.address)
-            if gas_price != 0:
-                break
+        self.assertEqual(self.get_balance_list(from_spl_token_acc, to_neon_acct.address), [from_balance, 0])
 
-            sleep(1)
-            wait_time += 1
-        self.assertNotEqual(gas_price, 0)
+        self.assertTrue(poll_until(
+            lambda: self.neon_gas_price_quick(to_neon_acct.address) != 0,
+            MAX_ZERO_GAS_PRICE_WAIT_TIME,
+            initial=0.2
+        ))
@@ -2,22 +2,27 @@ from __future__ import annotations
 
 import os
 import secrets
+import threading
 import requests
 import solcx
 import time
 
 from dataclasses import dataclass
+from multiprocessing.dummy import Pool as ThreadPool
 from eth_account.account import LocalAccount as NeonLocalAccount, Account as NeonAccount, SignedTransaction
 from web3 import Web3, eth as web3_eth
+from solana.rpc.api import Client as RPCSolClient
+from solana.rpc.commitment import Confirmed as RPCSolConfirmed
 from web3.types import TxReceipt, HexBytes, Wei, TxParams
-from typing import Type, Dict, Union, Optional, Any
+from typing import Type, Dict, Union, Optional, Any, List, Callable, Set, Tuple
 
 from proxy.common_neon.web3 import NeonWeb3
 from proxy.common_neon.config import Config
-from proxy.common_neon.constants import MIN_FINALIZE_SEC
-from proxy.common_neon.solana_interactor import SolInteractor
+from proxy.common_neon.constants import MIN_FINALIZE_SEC, ONE_BLOCK_SEC
+from proxy.common_neon.solana_interactor import SolInteractor, SolRecentBlockHash
 from proxy.common_neon.solana_tx import SolTx, SolAccount, SolSig, SolPubKey, SolCommit
 from proxy.common_neon.address import NeonAddress
+from proxy.common_neon.utils.utils import cached_property
 
 from proxy.neon_core_api.neon_layouts import NeonAccountInfo, NeonAccountStatus
 
@@ -49,12 +54,47 @@ class TransactionSent:
     tx_receipt: TxReceipt
 
 
+# keypairs with SOLs, which are reused by the next test runs
+SOL_ACCOUNT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '.cache', 'sol_pool')
+# each cached keypair is given only once per process, test classes have own SolClients and run in several threads
+_acquired_sol_account_set: Set[str] = set()
+_acquired_sol_account_lock = threading.Lock()
+
+
+def poll_until(predicate: Callable[[], bool], timeout: float,
+               initial: float = 0.1, factor: float = 1.5, cap: float = 1.0) -> bool:
+    """Checks the predicate with an exponential backoff until it is true or the timeout is reached"""
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        if predicate():
+            return True
+
+        time_left = deadline - time.monotonic()
+        if time_left <= 0:
+            return False
+
+        time.sleep(min(delay, time_left))
+        delay = min(delay * factor, cap)
+
+
+def run_parallel(*func_list: Callable[[], Any]) -> List[Any]:
+    """Calls independent functions in threads, returns results in the order of functions"""
+    with ThreadPool(max(min(len(func_list), 8), 1)) as pool:
+        return pool.map(lambda func: func(), func_list)
+
+
 class Proxy:
     _CONTRACT_TYPE = Type[web3_eth.Contract]
 
     def __init__(self):
         proxy_url = os.environ.get('PROXY_URL', 'http://localhost:9090/solana')
-        self._web3 = NeonWeb3(Web3.HTTPProvider(proxy_url))
+        # keep-alive connections are shared by all requests to the proxy, including JSON-RPC batches
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._web3 = NeonWeb3(Web3.HTTPProvider(proxy_url, session=self._session))
         self._proxy = self._web3.eth
         self._proxy.set_gas_price_strategy(self._get_gas_price)
 
@@ -106,11 +146,19 @@ class Proxy:
     def web3(self) -> NeonWeb3:
         return self._web3
 
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+    @cached_property
+    def chain_id(self) -> int:
+        return self._proxy.chain_id
+
     def sign_transaction(self, signer: NeonLocalAccount, tx: dict) -> TransactionSigned:
         if 'gas' not in tx:
             tx['gas'] = 987654321
         if 'chainId' not in tx:
-            tx['chainId'] = self._proxy.chain_id
+            tx['chainId'] = self.chain_id
         if 'gasPrice' not in tx:
             tx['gasPrice'] = self._proxy.gas_price
         if 'nonce' not in tx:
@@ -180,19 +228,57 @@ class Proxy:
     def emulate(self, tx: bytes) -> Dict[str, Any]:
         return self._web3.neon.neon_emulate(tx)
 
+    def neon_gas_price_batch(self, param_list: List[Dict[str, Any]]) -> List[int]:
+        # one HTTP request for all params, responses are matched by id
+        request_list = [
+            {'jsonrpc': '2.0', 'id': idx, 'method': 'neon_gasPrice', 'params': [param]}
+            for idx, param in enumerate(param_list)
+        ]
+        r = self._session.post(self._web3.provider.endpoint_uri, json=request_list)
+        if not r.ok:
+            print()
+            print('Bad response:', r)
+        assert r.ok
+
+        response_dict = {response['id']: response for response in r.json()}
+        gas_price_list: List[int] = list()
+        for idx in range(len(param_list)):
+            response = response_dict[idx]
+            assert 'result' in response, response
+            gas_price = response['result']['gasPrice']
+            gas_price_list.append(gas_price if isinstance(gas_price, int) else int(gas_price, 16))
+        return gas_price_list
+
 
 class SolClient(SolInteractor):
     def __init__(self, config: Config):
-        super().__init__(config)
-
-    def send_tx(self, tx: SolTx, signer: SolAccount, skip_preflight=False) -> Optional[SolSig]:
-        recent_resp = self.get_recent_block_hash(SolCommit.Finalized)
+        # tests send requests from several threads (see run_parallel)
+        super().__init__(config, pool_size=16)
+        self._recent_block_hash_dict: Dict[str, Tuple[float, SolRecentBlockHash]] = dict()
+
+    def get_cached_recent_block_hash(self, commitment=SolCommit.Confirmed) -> SolRecentBlockHash:
+        # the block hash is the same for all txs, which are sent in one slot
+        now = time.monotonic()
+        cached_time, recent_resp = self._recent_block_hash_dict.get(commitment, (0.0, None))
+        if (recent_resp is None) or (now - cached_time > ONE_BLOCK_SEC):
+            recent_resp = self.get_recent_block_hash(commitment)
+            self._recent_block_hash_dict[commitment] = (now, recent_resp)
+        return recent_resp
+
+    @cached_property
+    def raw_client(self) -> RPCSolClient:
+        # solana-py client for spl-token helpers, it keeps its connection for the lifetime of SolClient
+        return RPCSolClient(self._config.random_solana_url, commitment=RPCSolConfirmed)
+
+    def send_tx(self, tx: SolTx, signer: SolAccount, skip_preflight=False,
+                preflight_commitment=SolCommit.Processed) -> Optional[SolSig]:
+        recent_resp = self.get_cached_recent_block_hash()
 
         tx.recent_block_hash = recent_resp.block_hash
         tx.sign(signer)
         now = time.time()
         print(f'-> {now} send solana tx {tx.name}: {tx.sig}')
-        sent_resp = self.send_tx_list([tx], skip_preflight=skip_preflight)[0]
+        sent_resp = self.send_tx_list([tx], skip_preflight, preflight_commitment)[0]
         if sent_resp.result is None:
             print(f'-> fail to send tx: {sent_resp.error}')
             return None
@@ -208,5 +294,42 @@ class SolClient(SolInteractor):
 
         return SolSig.from_string(tx_sig)
 
-    def request_airdrop(self, acct: SolPubKey, amount: int) -> None:
-        self._send_rpc_request('requestAirdrop', str(acct), amount)
+    def request_airdrop(self, acct: SolPubKey, amount: int) -> Optional[str]:
+        response = self._send_rpc_request('requestAirdrop', str(acct), amount)
+        return response.get('result', None)
+
+    def confirm_tx_sig(self, tx_sig: str, commitment=SolCommit.Confirmed) -> bool:
+        return self.check_confirm_of_tx_sig_list([tx_sig], commitment, MIN_FINALIZE_SEC)
+
+    def acquire_funded_account(self, min_balance: int, airdrop_balance: int,
+                               cache_path: str = SOL_ACCOUNT_CACHE_PATH) -> SolAccount:
+        # the airdrop should leave a margin over the threshold, otherwise the first fee makes the account useless
+        assert airdrop_balance > min_balance, f'Airdrop {airdrop_balance} should be above the reuse threshold'
+        os.makedirs(cache_path, exist_ok=True)
+
+        with _acquired_sol_account_lock:
+            acct_list: List[SolAccount] = list()
+            for file_name in sorted(os.listdir(cache_path)):
+                if file_name in _acquired_sol_account_set:
+                    continue
+                with open(os.path.join(cache_path, file_name), 'rb') as f:
+                    acct_list.append(SolAccount.from_bytes(f.read()))
+
+            # balances of all cached keypairs are read with one request, the data of accounts isn't needed
+            acct_info_list = self.get_account_info_list([acct.pubkey() for acct in acct_list], length=0)
+            for acct, acct_info in zip(acct_list, acct_info_list):
+                if (acct_info is not None) and (acct_info.lamports >= min_balance):
+                    _acquired_sol_account_set.add(str(acct.pubkey()))
+                    return acct
+
+        acct = SolAccount()
+        tx_sig = self.request_airdrop(acct.pubkey(), airdrop_balance)
+        assert tx_sig is not None, 'Fail to request airdrop'
+        assert self.confirm_tx_sig(tx_sig), f'Airdrop {tx_sig} is not confirmed'
+
+        # the keypair is marked before it appears in the cache, so other threads skip it
+        with _acquired_sol_account_lock:
+            _acquired_sol_account_set.add(str(acct.pubkey()))
+        with open(os.path.join(cache_path, str(acct.pubkey())), 'wb') as f:
+            f.write(bytes(acct))
+        return acct